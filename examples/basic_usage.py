@@ -11,6 +11,11 @@ Run from project root:
 import asyncio
 import os
 
+try:
+    import uvloop  # Optional: faster event loop for these network-bound runs
+except ImportError:
+    uvloop = None
+
 from openkeywords import KeywordGenerator, CompanyInfo, GenerationConfig
 
 
@@ -62,4 +67,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
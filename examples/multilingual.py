@@ -14,6 +14,11 @@ Run from project root:
 import asyncio
 import os
 
+try:
+    import uvloop  # Optional: faster event loop for these network-bound runs
+except ImportError:
+    uvloop = None
+
 from openkeywords import KeywordGenerator, CompanyInfo, GenerationConfig
 
 
@@ -35,11 +40,10 @@ async def generate_for_market(generator, company_name, language, region, industr
         region=region,
     )
 
-    print(f"\nMarket: {language.upper()} ({region.upper()})")
-    print(f"Company: {company_name}")
-
     result = await generator.generate(company, config)
 
+    print(f"\nMarket: {language.upper()} ({region.upper()})")
+    print(f"Company: {company_name}")
     print(f"Generated {len(result.keywords)} keywords")
     print(f"Average score: {result.statistics.avg_score:.1f}")
 
@@ -59,38 +63,42 @@ async def main():
 
     print("OpenKeywords - Multi-Language Demo")
 
-    # English (US market)
-    await generate_for_market(
-        generator,
-        company_name="TechCorp Solutions",
-        language="english",
-        region="us",
-        industry="Cloud Software",
-        services=["cloud hosting", "data storage", "backup solutions"],
-    )
-
-    # German (German market)
-    await generate_for_market(
-        generator,
-        company_name="SCAILE Technologies GmbH",
-        language="german",
-        region="de",
-        industry="AEO Marketing",
-        services=["KI-Sichtbarkeit", "Content-Optimierung", "SEO"],
-    )
-
-    # Spanish (Mexico market)
-    await generate_for_market(
-        generator,
-        company_name="Soluciones Digitales MX",
-        language="spanish",
-        region="mx",
-        industry="Marketing Digital",
-        services=["marketing digital", "publicidad en linea", "redes sociales"],
+    # Markets have no data dependency, so generate them concurrently
+    await asyncio.gather(
+        # English (US market)
+        generate_for_market(
+            generator,
+            company_name="TechCorp Solutions",
+            language="english",
+            region="us",
+            industry="Cloud Software",
+            services=["cloud hosting", "data storage", "backup solutions"],
+        ),
+        # German (German market)
+        generate_for_market(
+            generator,
+            company_name="SCAILE Technologies GmbH",
+            language="german",
+            region="de",
+            industry="AEO Marketing",
+            services=["KI-Sichtbarkeit", "Content-Optimierung", "SEO"],
+        ),
+        # Spanish (Mexico market)
+        generate_for_market(
+            generator,
+            company_name="Soluciones Digitales MX",
+            language="spanish",
+            region="mx",
+            industry="Marketing Digital",
+            services=["marketing digital", "publicidad en linea", "redes sociales"],
+        ),
     )
 
     print("\nMulti-language demo complete!")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
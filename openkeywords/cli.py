@@ -6,6 +6,7 @@ import asyncio
 import logging
 import os
 import sys
+from typing import Optional
 
 import click
 from rich.console import Console
@@ -18,9 +19,12 @@ from .models import CompanyInfo, GenerationConfig
 console = Console()
 
 
-def setup_logging(verbose: bool):
-    """Configure logging based on verbosity."""
-    level = logging.DEBUG if verbose else logging.WARNING
+def setup_logging(verbose: bool, log_level: Optional[str] = None):
+    """Configure logging based on verbosity or an explicit log level."""
+    if log_level:
+        level = getattr(logging, log_level.upper())
+    else:
+        level = logging.DEBUG if verbose else logging.WARNING
     logging.basicConfig(
         level=level,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -58,6 +62,12 @@ def main():
 @click.option("--output", "-o", default=None, help="Output file (csv or json)")
 @click.option("--competitors", default=None, help="Competitor URLs (comma-separated)")
 @click.option("--verbose", "-v", is_flag=True, help="Verbose output")
+@click.option(
+    "--log-level",
+    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
+    default=None,
+    help="Log level (overrides --verbose)",
+)
 def generate(
     company: str,
     url: str,
@@ -77,6 +87,7 @@ def generate(
     competitors: str,
     output: str,
     verbose: bool,
+    log_level: Optional[str],
 ):
     """
     Generate SEO keywords for a company.
@@ -89,7 +100,7 @@ def generate(
 
         openkeywords generate -c "Acme" --with-research --output keywords.csv
     """
-    setup_logging(verbose)
+    setup_logging(verbose, log_level)
 
     # Check API keys
     if not os.getenv("GEMINI_API_KEY"):
@@ -1,17 +1,54 @@
 # ABOUTME: Standalone DataForSEO client for SERP analysis
 # ABOUTME: Provides featured snippets, PAA, related searches for AEO scoring
 
+import asyncio
 import base64
+import json
 import logging
 import os
-from dataclasses import dataclass, field
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional, Any
 
 import httpx
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Difficulty estimate from the Keywords Data competition level ("LOW", "MEDIUM", "HIGH" or null)
+_DIFFICULTY_MAP = {"LOW": 25, "MEDIUM": 50, "HIGH": 75, None: 50, "": 50}
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request payload, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(content: bytes) -> Any:
+    """Decode a response body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 # DataForSEO location codes for common countries
 LOCATION_CODES = {
@@ -83,7 +120,46 @@ LANGUAGE_CODES = {
 }
 
 
-@dataclass
+class _RateLimiter:
+    """
+    Async token bucket allowing ``max_rate`` acquisitions per ``time_period`` seconds.
+    
+    Usable as ``async with limiter:`` around a request.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._last = time.monotonic()
+    
+    async def acquire(self) -> None:
+        refill_rate = self.max_rate / self.time_period
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.max_rate, self._tokens + (now - self._last) * refill_rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / refill_rate)
+    
+    async def __aenter__(self) -> None:
+        await self.acquire()
+    
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+@lru_cache(maxsize=256)
+def _resolve(country: str, language: str) -> tuple[int, str]:
+    """Resolve country and language to DataForSEO location and language codes."""
+    country = country.lower()
+    language = language.lower()
+    return LOCATION_CODES.get(country, 2840), LANGUAGE_CODES.get(language, language)
+
+
+@dataclass(slots=True)
 class SearchResult:
     """A single search result from SERP."""
     position: int
@@ -93,7 +169,7 @@ class SearchResult:
     displayed_link: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class SerpResponse:
     """Response from a SERP query."""
     success: bool
@@ -105,30 +181,42 @@ class SerpResponse:
     people_also_ask: list[dict] = field(default_factory=list)
     related_searches: list[dict] = field(default_factory=list)
     total_results: int = 0
-    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    cached: bool = False
+    timestamp_ns: int = field(default_factory=time.time_ns)
+
+    @property
+    def timestamp(self) -> str:
+        """UTC ISO-8601 creation time, formatted on demand."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9, tz=timezone.utc).isoformat()
 
     def to_dict(self) -> dict[str, Any]:
-        return {
-            "success": self.success,
-            "query": self.query,
-            "results": [
-                {
-                    "position": r.position,
-                    "title": r.title,
-                    "link": r.link,
-                    "snippet": r.snippet,
-                    "displayed_link": r.displayed_link,
-                }
-                for r in self.results
-            ],
-            "cost": self.cost,
-            "error": self.error,
-            "featured_snippet": self.featured_snippet,
-            "people_also_ask": self.people_also_ask,
-            "related_searches": self.related_searches,
-            "total_results": self.total_results,
-            "timestamp": self.timestamp,
-        }
+        data = asdict(self)
+        del data["timestamp_ns"]
+        data["timestamp"] = self.timestamp
+        return data
+
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON, using orjson when available."""
+        return _json_dumps(self.to_dict())
+
+
+def _copy_response(response: SerpResponse, **changes: Any) -> SerpResponse:
+    """
+    Copy a SERP response so the cache and callers never share mutable parts.
+    
+    Only the containers are copied: results are flat dataclasses and the
+    PAA, related-search and snippet entries are flat dicts of scalars, so
+    this isolates them at a fraction of the cost of a deepcopy.
+    """
+    featured_snippet = response.featured_snippet
+    return replace(
+        response,
+        results=[replace(r) for r in response.results],
+        people_also_ask=[dict(p) for p in response.people_also_ask],
+        related_searches=[dict(r) for r in response.related_searches],
+        featured_snippet=dict(featured_snippet) if featured_snippet else None,
+        **changes,
+    )
 
 
 class DataForSEOClient:
@@ -142,17 +230,48 @@ class DataForSEOClient:
     - Related searches
     - Keyword volume and difficulty data
     
+    Requests are paced client-side with token buckets (``serp_qpm`` for SERP
+    queries, ``keywords_qpm`` for keyword volume/difficulty) to stay under
+    DataForSEO rate limits during concurrent fan-out.
+    
+    Successful SERP responses are cached in memory for ``cache_ttl`` seconds
+    (set to 0 to disable); cache hits are returned with ``cached=True`` and
+    no cost.
+    
     Requires DATAFORSEO_LOGIN and DATAFORSEO_PASSWORD environment variables.
     """
     
     SERP_URL = "https://api.dataforseo.com/v3/serp/google/organic/live/advanced"
     KEYWORDS_URL = "https://api.dataforseo.com/v3/keywords_data/google_ads/search_volume/live"
+    DIFFICULTY_URL = "https://api.dataforseo.com/v3/dataforseo_labs/google/keyword_difficulty/live"
     
-    def __init__(self, login: Optional[str] = None, password: Optional[str] = None):
+    def __init__(
+        self,
+        login: Optional[str] = None,
+        password: Optional[str] = None,
+        cache_ttl: float = 3600.0,
+        cache_size: int = 10_000,
+        serp_qpm: int = 500,
+        keywords_qpm: int = 2000,
+    ):
         self.api_login = login or os.getenv("DATAFORSEO_LOGIN")
         self.api_password = password or os.getenv("DATAFORSEO_PASSWORD")
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._auth_header = ""
+        
+        # (query, lang_code, location_code, depth) -> (expires_at, response)
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._serp_cache: OrderedDict[tuple, tuple[float, SerpResponse]] = OrderedDict()
+        
+        self._serp_limiter = _RateLimiter(serp_qpm)
+        self._kw_limiter = _RateLimiter(keywords_qpm)
         
         if self.is_configured():
+            credentials = f"{self.api_login}:{self.api_password}"
+            encoded = base64.b64encode(credentials.encode()).decode()
+            self._auth_header = f"Basic {encoded}"
             logger.info("DataForSEO client initialized")
         else:
             logger.warning(
@@ -166,9 +285,124 @@ class DataForSEOClient:
     
     def _get_auth_header(self) -> str:
         """Get Basic auth header for DataForSEO API."""
-        credentials = f"{self.api_login}:{self.api_password}"
-        encoded = base64.b64encode(credentials.encode()).decode()
-        return f"Basic {encoded}"
+        return self._auth_header
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP client, creating it on first use.
+        
+        HTTP/2 lets concurrent searches multiplex over a single connection.
+        The pool is rebuilt if the client is reused from a different event
+        loop, since pooled connections belong to the loop that opened them.
+        The replacement is installed before the previous pool is closed, so
+        concurrent callers never see a missing client and no pool is leaked
+        per asyncio.run.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            old_client, old_loop = self._client, self._client_loop
+            self._client_loop = loop
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=httpx.Timeout(30.0),
+                http2=True,
+                headers={
+                    "Authorization": self._auth_header,
+                    "Content-Type": "application/json",
+                },
+            )
+            if old_client is not None and not old_client.is_closed:
+                await self._close_http_client(old_client, old_loop)
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client and release its connections."""
+        client, client_loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client is not None:
+            await self._close_http_client(client, client_loop)
+    
+    @staticmethod
+    async def _close_http_client(
+        client: httpx.AsyncClient,
+        client_loop: Optional[asyncio.AbstractEventLoop],
+    ) -> None:
+        """
+        Close an HTTP client that has already been detached from the instance.
+        
+        A client left over from a previous event loop may fail to close
+        cleanly once that loop has shut down; the error is logged and the
+        reference dropped so its sockets are released on collection.
+        """
+        if client_loop is asyncio.get_running_loop():
+            await client.aclose()
+            return
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing HTTP client from a previous event loop: {e}")
+    
+    @retry(
+        stop=stop_after_attempt(4),
+        wait=wait_random_exponential(multiplier=0.5, max=8),
+        retry=retry_if_exception_type((httpx.TransportError, httpx.HTTPStatusError)),
+        reraise=True,
+    )
+    async def _post(
+        self,
+        url: str,
+        payload: list[dict],
+        limiter: _RateLimiter,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        POST a payload through the pooled client, retrying transient failures.
+        
+        Connection errors, 429 and 5xx responses are retried with exponential
+        backoff and jitter. Other responses are returned for the caller to handle.
+        """
+        client = await self._get_client()
+        async with limiter:
+            response = await client.post(
+                url,
+                content=_json_dumps(payload),
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            )
+        if response.status_code in RETRY_STATUS_CODES:
+            response.raise_for_status()
+        return response
+    
+    def _cache_get(self, key: tuple) -> Optional[SerpResponse]:
+        """Return a cached SERP response, dropping it if expired."""
+        entry = self._serp_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._serp_cache[key]
+            return None
+        self._serp_cache.move_to_end(key)
+        return _copy_response(response, cached=True, cost=0.0)
+    
+    def _cache_put(self, key: tuple, response: SerpResponse) -> None:
+        """Cache a successful SERP response, evicting the least recently used."""
+        if self.cache_ttl <= 0 or not response.success:
+            return
+        self._serp_cache[key] = (time.monotonic() + self.cache_ttl, _copy_response(response))
+        self._serp_cache.move_to_end(key)
+        while len(self._serp_cache) > self.cache_size:
+            self._serp_cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Drop all cached SERP responses."""
+        self._serp_cache.clear()
+    
+    async def __aenter__(self) -> "DataForSEOClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
     
     async def search(
         self,
@@ -196,41 +430,40 @@ class DataForSEOClient:
                 error="DataForSEO credentials not configured",
             )
         
+        location_code, lang_code = _resolve(country, language)
+        depth = min(num_results, 100)
+        cache_key = (query, lang_code, location_code, depth)
+        
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            location_code = LOCATION_CODES.get(country.lower(), 2840)
-            lang_code = LANGUAGE_CODES.get(language.lower(), language.lower())
-            
             payload = [
                 {
                     "keyword": query,
                     "location_code": location_code,
                     "language_code": lang_code,
-                    "depth": min(num_results, 100),
+                    "depth": depth,
                 }
             ]
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.SERP_URL,
-                    json=payload,
-                    headers={
-                        "Authorization": self._get_auth_header(),
-                        "Content-Type": "application/json",
-                    },
+            response = await self._post(self.SERP_URL, payload, self._serp_limiter)
+            
+            if response.status_code in (401, 403):
+                return SerpResponse(
+                    success=False,
+                    query=query,
+                    error="DataForSEO authentication failed",
                 )
-                
-                if response.status_code in (401, 403):
-                    return SerpResponse(
-                        success=False,
-                        query=query,
-                        error="DataForSEO authentication failed",
-                    )
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                # Parse the response
-                return self._parse_response(data, query)
+            
+            response.raise_for_status()
+            data = _json_loads(response.content)
+            
+            # Parse the response
+            serp = self._parse_response(data, query)
+            self._cache_put(cache_key, serp)
+            return serp
         
         except httpx.TimeoutException:
             return SerpResponse(
@@ -246,6 +479,37 @@ class DataForSEOClient:
                 error=f"DataForSEO error: {str(e)}",
             )
     
+    async def search_many(
+        self,
+        queries: list[str],
+        num_results: int = 10,
+        language: str = "en",
+        country: str = "us",
+        concurrency: int = 20,
+    ) -> list[SerpResponse]:
+        """
+        Run SERP searches for many queries concurrently.
+        
+        Args:
+            queries: Search queries
+            num_results: Number of results per query (max 100)
+            language: Language code (e.g., "en", "de")
+            country: Country code (e.g., "us", "de")
+            concurrency: Maximum number of in-flight requests
+        
+        Returns:
+            SerpResponse per query, in the same order as queries
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _search_one(query: str) -> SerpResponse:
+            async with semaphore:
+                return await self.search(
+                    query, num_results=num_results, language=language, country=country
+                )
+        
+        return await asyncio.gather(*(_search_one(q) for q in queries))
+    
     def _parse_response(self, data: dict, query: str) -> SerpResponse:
         """Parse DataForSEO response into standardized format."""
         results = []
@@ -263,47 +527,51 @@ class DataForSEOClient:
         if not result_data:
             return SerpResponse(success=True, query=query, results=[])
         
-        items = result_data[0].get("items", [])
+        items = result_data[0].get("items") or []
+        
+        # Bind hot names locally; this loop runs once per item for up to 100+ items
+        _SR = SearchResult
+        add_result = results.append
+        add_paa = people_also_ask.append
+        add_related = related_searches.append
         
         for item in items:
-            item_type = item.get("type", "")
-            
-            # Organic results
-            if item_type == "organic":
-                results.append(SearchResult(
-                    position=item.get("rank_absolute", 0),
-                    title=item.get("title", ""),
-                    link=item.get("url", ""),
-                    snippet=item.get("description", ""),
-                    displayed_link=item.get("breadcrumb", ""),
-                ))
-            
-            # Featured snippet
-            elif item_type == "featured_snippet" and not featured_snippet:
-                featured_snippet = {
-                    "title": item.get("title"),
-                    "snippet": item.get("description"),
-                    "link": item.get("url"),
-                }
-            
-            # People Also Ask
-            elif item_type == "people_also_ask":
-                paa_items = item.get("items", [])
-                for paa in paa_items:
-                    people_also_ask.append({
-                        "question": paa.get("title"),
-                        "snippet": paa.get("description"),
-                        "link": paa.get("url"),
-                    })
-            
-            # Related searches
-            elif item_type == "related_searches":
-                rs_items = item.get("items", [])
-                for rs in rs_items:
-                    if isinstance(rs, str):
-                        related_searches.append({"query": rs})
-                    elif isinstance(rs, dict):
-                        related_searches.append({"query": rs.get("title")})
+            g = item.get
+            match g("type", ""):
+                # Organic results
+                case "organic":
+                    add_result(_SR(
+                        g("rank_absolute", 0),
+                        g("title", ""),
+                        g("url", ""),
+                        g("description", ""),
+                        g("breadcrumb", ""),
+                    ))
+                
+                # Featured snippet (first one wins)
+                case "featured_snippet" if featured_snippet is None:
+                    featured_snippet = {
+                        "title": g("title"),
+                        "snippet": g("description"),
+                        "link": g("url"),
+                    }
+                
+                # People Also Ask
+                case "people_also_ask":
+                    for paa in g("items") or []:
+                        add_paa({
+                            "question": paa.get("title"),
+                            "snippet": paa.get("description"),
+                            "link": paa.get("url"),
+                        })
+                
+                # Related searches
+                case "related_searches":
+                    for rs in g("items") or []:
+                        if isinstance(rs, str):
+                            add_related({"query": rs})
+                        elif isinstance(rs, dict):
+                            add_related({"query": rs.get("title")})
         
         # Cost: $0.50 per 1,000 queries = $0.0005 per query
         cost = 0.0005
@@ -346,73 +614,34 @@ class DataForSEOClient:
         if not keywords:
             return {}
         
-        # Limit to 1000 keywords per request (API limit)
-        keywords = keywords[:1000]
+        # Drop case-insensitive duplicates, then limit to 1000 keywords (API limit)
+        keywords = list(dict.fromkeys(k.lower() for k in keywords))[:1000]
         
         try:
-            credentials = f"{self.api_login}:{self.api_password}"
-            encoded_credentials = base64.b64encode(credentials.encode()).decode()
-            auth_header = f"Basic {encoded_credentials}"
-            
-            location_code = LOCATION_CODES.get(country.lower(), 2840)
+            location_code, lang_code = _resolve(country, language)
             
             # Build request payload
             payload = [
                 {
                     "keywords": keywords,
                     "location_code": location_code,
-                    "language_code": language,
+                    "language_code": lang_code,
                 }
             ]
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    "https://api.dataforseo.com/v3/keywords_data/google_ads/search_volume/live",
-                    json=payload,
-                    headers={
-                        "Authorization": auth_header,
-                        "Content-Type": "application/json",
-                    },
-                )
-                
-                if response.status_code in (401, 403):
-                    logger.error("DataForSEO authentication failed for keyword data")
-                    return {}
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                # Parse response
-                result_map = {}
-                
-                if data.get("tasks"):
-                    for task in data["tasks"]:
-                        if task.get("status_code") == 20000 and task.get("result"):
-                            for item in task["result"]:
-                                keyword = item.get("keyword", "").lower()
-                                if keyword:
-                                    # Handle competition - can be float or None
-                                    competition = item.get("competition")
-                                    if competition is None or not isinstance(competition, (int, float)):
-                                        competition = 0.0
-                                    
-                                    # Competition level is a string like "LOW", "MEDIUM", "HIGH"
-                                    comp_level = item.get("competition_level", "")
-                                    
-                                    # Estimate difficulty from competition level string
-                                    difficulty_map = {"LOW": 25, "MEDIUM": 50, "HIGH": 75}
-                                    difficulty = difficulty_map.get(str(comp_level).upper(), 50)
-                                    
-                                    result_map[keyword] = {
-                                        "volume": item.get("search_volume", 0) or 0,
-                                        "cpc": item.get("cpc", 0) or 0,
-                                        "competition": float(competition),
-                                        "competition_level": str(comp_level),
-                                        "difficulty": difficulty,
-                                    }
-                
-                logger.info(f"Got keyword data for {len(result_map)}/{len(keywords)} keywords")
-                return result_map
+            response = await self._post(
+                self.KEYWORDS_URL, payload, self._kw_limiter, timeout=60.0
+            )
+            
+            if response.status_code in (401, 403):
+                logger.error("DataForSEO authentication failed for keyword data")
+                return {}
+            
+            response.raise_for_status()
+            result_map = self._parse_keyword_data(_json_loads(response.content))
+            
+            logger.info(f"Got keyword data for {len(result_map)}/{len(keywords)} keywords")
+            return result_map
         
         except httpx.TimeoutException:
             logger.error("DataForSEO keyword data request timeout")
@@ -421,11 +650,95 @@ class DataForSEOClient:
             logger.error(f"DataForSEO keyword data error: {e}")
             return {}
     
+    async def get_keyword_data_columns(
+        self,
+        keywords: list[str],
+        language: str = "en",
+        country: str = "us",
+    ) -> dict[str, Any]:
+        """
+        Get keyword data as parallel columns instead of one dict per keyword.
+        
+        Numeric columns are typed ``array.array`` buffers aligned with
+        ``keywords``, so they can be wrapped without copying (for example
+        with ``numpy.frombuffer``) for vectorized scoring. Keywords missing
+        from the API response get volume/cpc/competition 0 and difficulty 50.
+        If the client is not configured or the request fails, every column
+        holds these defaults, which is indistinguishable from real
+        zero-volume data; check ``is_configured()`` first if that matters.
+        
+        Args:
+            keywords: List of keywords to analyze (max 1000 per request)
+            language: Language code (e.g., "en", "de")
+            country: Country code (e.g., "us", "de")
+        
+        Returns:
+            Dict with "keywords" (list[str]) and "volume", "cpc",
+            "competition", "difficulty" columns
+        """
+        unique = list(dict.fromkeys(k.lower() for k in keywords))[:1000]
+        data = await self.get_keyword_data(unique, language=language, country=country)
+        
+        n = len(unique)
+        volume = array("q", [0]) * n
+        cpc = array("d", [0.0]) * n
+        competition = array("d", [0.0]) * n
+        difficulty = array("b", [50]) * n
+        
+        for i, keyword in enumerate(unique):
+            row = data.get(keyword)
+            if row is not None:
+                volume[i] = row["volume"]
+                cpc[i] = row["cpc"]
+                competition[i] = row["competition"]
+                difficulty[i] = row["difficulty"]
+        
+        return {
+            "keywords": unique,
+            "volume": volume,
+            "cpc": cpc,
+            "competition": competition,
+            "difficulty": difficulty,
+        }
+    
+    def _parse_keyword_data(self, data: dict) -> dict[str, dict]:
+        """Parse a Keywords Data response into keyword -> metrics in a single pass."""
+        result_map = {}
+        
+        for task in data.get("tasks") or []:
+            if task.get("status_code") != 20000:
+                continue
+            for item in task.get("result") or []:
+                g = item.get
+                keyword = (g("keyword") or "").lower()
+                if not keyword:
+                    continue
+                
+                # Competition can be float, int or None
+                competition = g("competition")
+                if not isinstance(competition, float):
+                    competition = float(competition) if isinstance(competition, int) else 0.0
+                
+                # Competition level is "LOW", "MEDIUM", "HIGH" or null
+                comp_level = g("competition_level")
+                
+                result_map[keyword] = {
+                    "volume": g("search_volume") or 0,
+                    "cpc": g("cpc") or 0,
+                    "competition": competition,
+                    "competition_level": comp_level or "",
+                    "difficulty": _DIFFICULTY_MAP.get(comp_level, 50),
+                }
+        
+        return result_map
+    
     async def get_keyword_difficulty(
         self,
         keywords: list[str],
         language: str = "en",
         country: str = "us",
+        chunk_size: int = 100,
+        concurrency: int = 8,
     ) -> dict[str, int]:
         """
         Get keyword difficulty scores (0-100).
@@ -433,10 +746,15 @@ class DataForSEOClient:
         Uses DataForSEO Keyword Difficulty API for more accurate scores.
         Cost: ~$0.05 per keyword
         
+        Keywords are split into chunks that are posted concurrently, so the
+        server works on them in parallel instead of in one long request.
+        
         Args:
             keywords: List of keywords (max 1000)
             language: Language code
             country: Country code
+            chunk_size: Keywords per request
+            concurrency: Maximum number of in-flight requests
         
         Returns:
             Dict mapping keyword -> difficulty (0-100)
@@ -447,61 +765,96 @@ class DataForSEOClient:
         if not keywords:
             return {}
         
-        keywords = keywords[:1000]
+        # Drop case-insensitive duplicates; results are keyed by lowercase keyword
+        keywords = list(dict.fromkeys(k.lower() for k in keywords))[:1000]
+        location_code, lang_code = _resolve(country, language)
+        
+        chunks = [keywords[i:i + chunk_size] for i in range(0, len(keywords), chunk_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _post_chunk(chunk: list[str]) -> dict[str, int]:
+            async with semaphore:
+                return await self._post_difficulty(chunk, location_code, lang_code)
+        
+        result_map = {}
+        for chunk_result in await asyncio.gather(*(_post_chunk(c) for c in chunks)):
+            result_map.update(chunk_result)
         
+        logger.info(f"Got difficulty for {len(result_map)}/{len(keywords)} keywords")
+        return result_map
+    
+    async def _post_difficulty(
+        self,
+        keywords: list[str],
+        location_code: int,
+        lang_code: str,
+    ) -> dict[str, int]:
+        """Fetch difficulty scores for one chunk of keywords."""
         try:
-            credentials = f"{self.api_login}:{self.api_password}"
-            encoded_credentials = base64.b64encode(credentials.encode()).decode()
-            auth_header = f"Basic {encoded_credentials}"
-            
-            location_code = LOCATION_CODES.get(country.lower(), 2840)
-            
             # Build batch request - one keyword per task for difficulty
             payload = [
                 {
                     "keyword": kw,
                     "location_code": location_code,
-                    "language_code": language,
+                    "language_code": lang_code,
                 }
                 for kw in keywords
             ]
             
-            async with httpx.AsyncClient(timeout=90.0) as client:
-                response = await client.post(
-                    "https://api.dataforseo.com/v3/dataforseo_labs/google/keyword_difficulty/live",
-                    json=payload,
-                    headers={
-                        "Authorization": auth_header,
-                        "Content-Type": "application/json",
-                    },
-                )
-                
-                if response.status_code in (401, 403):
-                    logger.error("DataForSEO authentication failed for keyword difficulty")
-                    return {}
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                result_map = {}
-                
-                if data.get("tasks"):
-                    for task in data["tasks"]:
-                        if task.get("status_code") == 20000 and task.get("result"):
-                            for item in task["result"]:
-                                keyword = item.get("keyword", "").lower()
-                                difficulty = item.get("keyword_difficulty", 50)
-                                if keyword:
-                                    result_map[keyword] = int(difficulty) if difficulty else 50
-                
-                logger.info(f"Got difficulty for {len(result_map)}/{len(keywords)} keywords")
-                return result_map
+            response = await self._post(
+                self.DIFFICULTY_URL, payload, self._kw_limiter, timeout=90.0
+            )
+            
+            if response.status_code in (401, 403):
+                logger.error("DataForSEO authentication failed for keyword difficulty")
+                return {}
+            
+            response.raise_for_status()
+            data = _json_loads(response.content)
+            
+            result_map = {}
+            
+            if data.get("tasks"):
+                for task in data["tasks"]:
+                    if task.get("status_code") == 20000 and task.get("result"):
+                        for item in task["result"]:
+                            keyword = item.get("keyword", "").lower()
+                            difficulty = item.get("keyword_difficulty", 50)
+                            if keyword:
+                                result_map[keyword] = int(difficulty) if difficulty else 50
+            
+            return result_map
         
         except Exception as e:
             logger.error(f"DataForSEO keyword difficulty error: {e}")
             return {}
 
 
+_shared_clients: dict[tuple[Optional[str], Optional[str]], DataForSEOClient] = {}
+
+
+def _get_shared_client(login: Optional[str], password: Optional[str]) -> DataForSEOClient:
+    """Get a DataForSEOClient shared across search_serp calls with the same credentials."""
+    key = (login, password)
+    client = _shared_clients.get(key)
+    if client is None:
+        client = _shared_clients[key] = DataForSEOClient(login=login, password=password)
+    return client
+
+
+async def close_shared_clients() -> None:
+    """
+    Close the connection pools of clients shared by search_serp.
+    
+    Safe to call from a different event loop than the one the searches ran
+    on; pools left over from a previous loop are closed best-effort.
+    """
+    clients = list(_shared_clients.values())
+    _shared_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
 # Convenience function for one-off searches
 async def search_serp(
     query: str,
@@ -520,8 +873,12 @@ async def search_serp(
         login: Optional DataForSEO login (uses env var if not provided)
         password: Optional DataForSEO password (uses env var if not provided)
     
+    Repeated calls with the same credentials share one client, so its
+    connection pool and SERP cache are reused. Call close_shared_clients()
+    on shutdown to release the connections.
+    
     Returns:
         SerpResponse with results and SERP features
     """
-    client = DataForSEOClient(login=login, password=password)
+    client = _get_shared_client(login, password)
     return await client.search(query, country=country, language=language)
@@ -5,17 +5,40 @@ Finds long-tail, question-based content gaps optimized for Answer Engine Optimiz
 Targets: ChatGPT, Google AI Overviews, Perplexity, Bing Copilot
 """
 
+import logging
 import os
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import csv
-from typing import List, Dict, Optional
+import heapq
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
 from datetime import datetime
 import argparse
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
 BASE_URL = "https://api.seranking.com/v1"
 
+
+def _json_loads(content: bytes):
+    """Decode an API response body, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
 AEO_FILTERS = {
     "min_volume": 100,
     "max_volume": 5000,
@@ -52,13 +75,60 @@ AEO_INTENT_PATTERNS = {
     },
 }
 
-AEO_SERP_FEATURES = [
+# One precompiled alternation per intent, so matching a keyword is a single
+# C-level scan per intent instead of a Python loop of substring tests
+_INTENT_MATCHERS = [
+    (intent, config["multiplier"], re.compile("|".join(map(re.escape, config["keywords"]))))
+    for intent, config in AEO_INTENT_PATTERNS.items()
+]
+
+# Most question keywords lead with the question word, so a set lookup on the
+# first token settles the question intent without running its regex
+_QUESTION_FIRSTWORDS = frozenset(AEO_INTENT_PATTERNS["question"]["keywords"])
+
+
+@lru_cache(maxsize=65536)
+def _match_intents(keyword_lower: str):
+    """
+    Return (primary_intent, multiplier, matched_intents) for a lowercase keyword
+
+    Cached because overlapping competitors return many of the same keywords;
+    matched_intents is a tuple so cached results cannot be mutated by callers.
+    """
+    matched_intents = []
+    max_multiplier = 1.0
+    primary_intent = "other"
+    leads_with_question = keyword_lower.partition(" ")[0] in _QUESTION_FIRSTWORDS
+
+    for intent, multiplier, matcher in _INTENT_MATCHERS:
+        if (leads_with_question and intent == "question") or matcher.search(keyword_lower):
+            matched_intents.append(intent)
+            if multiplier > max_multiplier:
+                max_multiplier = multiplier
+                primary_intent = intent
+
+    return primary_intent, max_multiplier, tuple(matched_intents)
+
+
+AEO_SERP_FEATURES = frozenset({
     "people_also_ask",
     "featured_snippet",
     "sge",
     "knowledge_panel",
     "faq"
-]
+})
+
+# Comparison rows carry many fields nothing downstream reads; analyze_content_gaps
+# projects long-tail rows to these before scoring so later passes touch less data
+_GAP_KEEP = (
+    "keyword", "volume", "difficulty", "cpc", "competition",
+    "serp_features", "url", "position", "word_count",
+)
+
+# Concurrent page requests per competitor. analyze_content_gaps runs up to 8
+# competitor threads, each either fetching one page itself or waiting on its
+# wave, so at most 8 x 4 = 32 requests share the session's pool_maxsize=32
+_PAGE_WORKERS = 4
 
 
 class SEORankingAPI:
@@ -72,6 +142,20 @@ class SEORankingAPI:
         }
         self.base_url = BASE_URL
 
+        # Persistent session: keep-alive connections shared across calls and threads,
+        # with retries on throttling and transient server errors
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+        )
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries),
+        )
+
     def get_competitors(self, domain: str, source: str = "us", limit: int = 5) -> List[Dict]:
         """Get top competitors for a domain"""
         url = f"{self.base_url}/domain/competitors"
@@ -82,16 +166,54 @@ class SEORankingAPI:
         }
 
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, params=params, timeout=(5, 30))
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching competitors: {e}")
+            return _json_loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("Error fetching competitors: %s", e)
             return []
 
     def get_keyword_comparison(self, domain: str, compare_domain: str,
-                               source: str = "us", limit: int = 1000) -> List[Dict]:
+                               source: str = "us", limit: int = 1000,
+                               max_pages: int = 1) -> List[Dict]:
         """Get keywords that competitor ranks for but target domain doesn't"""
+        return list(self.iter_keyword_comparison(domain, compare_domain, source, limit, max_pages))
+
+    def iter_keyword_comparison(self, domain: str, compare_domain: str,
+                                source: str = "us", limit: int = 1000,
+                                max_pages: int = 1) -> Iterator[Dict]:
+        """
+        Yield keyword comparison rows page by page
+
+        Each page is a separate billable request, so only one page is fetched
+        unless max_pages is raised. Further pages are requested only while the
+        previous ones come back full, in waves of 1, 2, then up to
+        _PAGE_WORKERS concurrent requests, and yielded in offset order.
+        """
+        first_page = self._fetch_page(domain, compare_domain, source, limit, 0)
+        yield from first_page
+        if len(first_page) < limit or max_pages <= 1:
+            return
+
+        page = 1
+        wave_size = 1
+        with ThreadPoolExecutor(max_workers=min(_PAGE_WORKERS, max_pages - 1)) as executor:
+            while page < max_pages:
+                wave = range(page, min(page + wave_size, max_pages))
+                results = executor.map(
+                    lambda p: self._fetch_page(domain, compare_domain, source, limit, p * limit),
+                    wave,
+                )
+                for rows in results:
+                    yield from rows
+                    if len(rows) < limit:
+                        return
+                page = wave.stop
+                wave_size = min(wave_size * 2, _PAGE_WORKERS)
+
+    def _fetch_page(self, domain: str, compare_domain: str, source: str,
+                    limit: int, offset: int) -> List[Dict]:
+        """Fetch one page of the keyword comparison"""
         url = f"{self.base_url}/domain/keywords/comparison"
         params = {
             "source": source,
@@ -100,16 +222,17 @@ class SEORankingAPI:
             "type": "organic",
             "diff": 1,
             "limit": limit,
+            "offset": offset,
             "order_field": "difficulty",
             "order_type": "asc"
         }
 
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, params=params, timeout=(5, 30))
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching keyword comparison: {e}")
+            return _json_loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("Error fetching keyword comparison: %s", e)
             return []
 
 
@@ -119,48 +242,49 @@ class AEOContentGapAnalyzer:
     def __init__(self, api: SEORankingAPI):
         self.api = api
 
-    def filter_longtail_aeo(self, keywords: List[Dict],
+    def filter_longtail_aeo(self, keywords: Iterable[Dict],
                             filters: Optional[Dict] = None) -> List[Dict]:
         """Filter keywords for long-tail AEO opportunities"""
+        return list(self.iter_longtail_aeo(keywords, filters))
+
+    def iter_longtail_aeo(self, keywords: Iterable[Dict],
+                          filters: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yield the long-tail AEO opportunities in keywords, annotated with word_count"""
         if filters is None:
             filters = AEO_FILTERS
 
-        longtail = []
+        # Hoist thresholds out of the per-row loop
+        min_volume = filters["min_volume"]
+        max_volume = filters["max_volume"]
+        max_difficulty = filters["max_difficulty"]
+        max_competition = filters["max_competition"]
+        min_words = filters["min_words"]
 
         for kw in keywords:
-            volume = kw.get("volume", 0)
-            difficulty = kw.get("difficulty", 100)
-            competition = kw.get("competition", 1)
-            keyword_text = kw.get("keyword", "")
-            word_count = len(keyword_text.split())
-
-            if (filters["min_volume"] <= volume <= filters["max_volume"] and
-                difficulty <= filters["max_difficulty"] and
-                competition <= filters["max_competition"] and
-                word_count >= filters["min_words"]):
-
+            get = kw.get
+            # Cheap numeric checks first; only survivors pay for word counting
+            if not (min_volume <= get("volume", 0) <= max_volume and
+                    get("difficulty", 100) <= max_difficulty and
+                    get("competition", 1) <= max_competition):
+                continue
+
+            # API keywords are single-space separated, so counting spaces avoids
+            # building a throwaway list of tokens
+            keyword_text = get("keyword", "")
+            word_count = keyword_text.count(" ") + 1 if keyword_text else 0
+            if word_count >= min_words:
                 kw["word_count"] = word_count
-                longtail.append(kw)
-
-        return longtail
+                yield kw
 
     def categorize_by_intent(self, keyword: Dict) -> Dict:
         """Categorize keyword by AEO intent and add multiplier"""
-        keyword_lower = keyword["keyword"].lower()
-        matched_intents = []
-        max_multiplier = 1.0
-        primary_intent = "other"
-
-        for intent, config in AEO_INTENT_PATTERNS.items():
-            if any(pattern in keyword_lower for pattern in config["keywords"]):
-                matched_intents.append(intent)
-                if config["multiplier"] > max_multiplier:
-                    max_multiplier = config["multiplier"]
-                    primary_intent = intent
+        primary_intent, max_multiplier, matched_intents = _match_intents(
+            keyword["keyword"].lower()
+        )
 
         keyword["intent"] = primary_intent
         keyword["intent_multiplier"] = max_multiplier
-        keyword["matched_intents"] = matched_intents
+        keyword["matched_intents"] = list(matched_intents)
 
         return keyword
 
@@ -185,55 +309,105 @@ class AEOContentGapAnalyzer:
 
         AEO Score = (Volume x Intent Multiplier x SERP Feature Boost) / (Difficulty + 1)
         """
-        volume = keyword.get("volume", 0)
-        difficulty = keyword.get("difficulty", 100)
-        intent_multiplier = keyword.get("intent_multiplier", 1.0)
-        aeo_feature_boost = keyword.get("aeo_feature_boost", 1.0)
+        get = keyword.get
+        volume = get("volume", 0)
+        difficulty = get("difficulty", 100)
+        intent_multiplier = get("intent_multiplier", 1.0)
+        aeo_feature_boost = get("aeo_feature_boost", 1.0)
 
         aeo_score = (volume * intent_multiplier * aeo_feature_boost) / (difficulty + 1)
 
         keyword["aeo_score"] = round(aeo_score, 2)
         return aeo_score
 
+    def _score_row(self, kw: Dict, competitor: str) -> Dict:
+        """
+        Score one gap row in a single pass
+
+        Fuses categorize_by_intent, check_aeo_serp_features and calculate_aeo_score:
+        inputs are read once into locals and all outputs written in one update.
+        """
+        get = kw.get
+        intent, intent_multiplier, matched_intents = _match_intents(kw["keyword"].lower())
+
+        aeo_features = [f for f in get("serp_features", []) if f in AEO_SERP_FEATURES]
+        aeo_feature_boost = 1.3 if aeo_features else 1.0
+
+        aeo_score = (
+            get("volume", 0) * intent_multiplier * aeo_feature_boost
+        ) / (get("difficulty", 100) + 1)
+
+        kw.update({
+            "competitor": competitor,
+            "intent": intent,
+            "intent_multiplier": intent_multiplier,
+            "matched_intents": list(matched_intents),
+            "aeo_serp_features": aeo_features,
+            "has_aeo_features": bool(aeo_features),
+            "aeo_feature_boost": aeo_feature_boost,
+            "aeo_score": round(aeo_score, 2),
+        })
+        return kw
+
     def analyze_content_gaps(self, domain: str, competitors: Optional[List[str]] = None,
-                            source: str = "us", max_competitors: int = 3) -> List[Dict]:
+                            source: str = "us", max_competitors: int = 3,
+                            top_n: Optional[int] = None, max_pages: int = 1) -> List[Dict]:
         """
         Analyze content gaps for AEO optimization
+
+        If top_n is given, only the top_n highest-scoring opportunities are returned.
+        max_pages caps the billable comparison pages fetched per competitor.
         """
-        print(f"\nAnalyzing AEO Content Gaps for: {domain}")
+        logger.info("Analyzing AEO content gaps for: %s", domain)
 
         if not competitors:
-            print(f"\nFinding top {max_competitors} competitors...")
+            logger.info("Finding top %d competitors...", max_competitors)
             competitor_data = self.api.get_competitors(domain, source, max_competitors)
             competitors = [c["domain"] for c in competitor_data[:max_competitors]]
-            print(f"Found competitors: {', '.join(competitors)}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Found competitors: %s", ", ".join(competitors))
+
+        by_score = itemgetter("aeo_score")
+
+        # Fetch all competitor comparisons concurrently; results are streamed
+        # through filtering and scoring in competitor order, so only the scored
+        # rows (or just the top_n of them) stay alive
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(competitors)))) as executor:
+            results = executor.map(
+                lambda competitor: self.api.get_keyword_comparison(
+                    domain, competitor, source, max_pages=max_pages
+                ),
+                competitors,
+            )
+            scored = self._iter_scored_gaps(competitors, results)
+
+            if top_n is None:
+                all_gaps = sorted(scored, key=by_score, reverse=True)
+            else:
+                all_gaps = heapq.nlargest(top_n, scored, key=by_score)
 
-        all_gaps = []
+        return all_gaps
 
-        for i, competitor in enumerate(competitors, 1):
-            print(f"\n[{i}/{len(competitors)}] Comparing with {competitor}...")
+    def _iter_scored_gaps(self, competitors: List[str],
+                          results: Iterable[List[Dict]]) -> Iterator[Dict]:
+        """Filter and score each competitor's comparison rows as they arrive"""
+        total = 0
 
-            gaps = self.api.get_keyword_comparison(domain, competitor, source)
+        for i, (competitor, gaps) in enumerate(zip(competitors, results), 1):
+            logger.info("[%d/%d] Comparing with %s...", i, len(competitors), competitor)
 
             if gaps:
-                print(f"  Found {len(gaps)} total keyword gaps")
-
-                longtail = self.filter_longtail_aeo(gaps)
-                print(f"  Filtered to {len(longtail)} long-tail AEO opportunities")
+                logger.info("Found %d total keyword gaps for %s", len(gaps), competitor)
 
-                for kw in longtail:
-                    kw["competitor"] = competitor
-                    self.categorize_by_intent(kw)
-                    self.check_aeo_serp_features(kw)
-                    self.calculate_aeo_score(kw)
+                count = 0
+                for kw in self.iter_longtail_aeo(gaps):
+                    count += 1
+                    row = {k: kw[k] for k in _GAP_KEEP if k in kw}
+                    yield self._score_row(row, competitor)
+                logger.info("Filtered to %d long-tail AEO opportunities", count)
+                total += count
 
-                all_gaps.extend(longtail)
-
-        all_gaps.sort(key=lambda x: x["aeo_score"], reverse=True)
-
-        print(f"\nTotal AEO opportunities found: {len(all_gaps)}")
-
-        return all_gaps
+        logger.info("Total AEO opportunities found: %d", total)
 
     def generate_summary_stats(self, gaps: List[Dict]) -> Dict:
         """Generate summary statistics"""
@@ -241,27 +415,38 @@ class AEOContentGapAnalyzer:
             return {}
 
         intent_counts = {}
+        with_aeo_features = 0
+        question_kw = 0
+        total_score = 0.0
+        total_volume = 0
+        total_difficulty = 0.0
+
         for gap in gaps:
             intent = gap.get("intent", "other")
             intent_counts[intent] = intent_counts.get(intent, 0) + 1
-
-        with_aeo_features = sum(1 for g in gaps if g.get("has_aeo_features", False))
-        question_kw = [g for g in gaps if g.get("intent") == "question"]
-
+            if gap.get("has_aeo_features", False):
+                with_aeo_features += 1
+            if intent == "question":
+                question_kw += 1
+            total_score += gap["aeo_score"]
+            total_volume += gap["volume"]
+            total_difficulty += gap["difficulty"]
+
+        n = len(gaps)
         return {
-            "total_opportunities": len(gaps),
+            "total_opportunities": n,
             "intent_breakdown": intent_counts,
             "with_aeo_serp_features": with_aeo_features,
-            "question_keywords": len(question_kw),
-            "avg_aeo_score": round(sum(g["aeo_score"] for g in gaps) / len(gaps), 2),
-            "avg_volume": round(sum(g["volume"] for g in gaps) / len(gaps)),
-            "avg_difficulty": round(sum(g["difficulty"] for g in gaps) / len(gaps), 1),
+            "question_keywords": question_kw,
+            "avg_aeo_score": round(total_score / n, 2),
+            "avg_volume": round(total_volume / n),
+            "avg_difficulty": round(total_difficulty / n, 1),
         }
 
     def export_to_csv(self, gaps: List[Dict], filename: str):
         """Export results to CSV"""
         if not gaps:
-            print("No gaps to export")
+            logger.warning("No gaps to export")
             return
 
         fieldnames = [
@@ -269,18 +454,31 @@ class AEOContentGapAnalyzer:
             "aeo_score", "intent", "word_count", "has_aeo_features",
             "aeo_serp_features", "competitor", "url", "position"
         ]
+        getter = itemgetter(*fieldnames)
+        blank = dict.fromkeys(fieldnames, "")
+
+        def rows():
+            for gap in gaps:
+                features = gap.get("aeo_serp_features")
+                if isinstance(features, list):
+                    gap = {**gap, "aeo_serp_features": ";".join(features)}
+                yield getter({**blank, **gap})
 
         with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(gaps)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows())
 
         print(f"\nExported {len(gaps)} opportunities to: {filename}")
 
     def export_to_json(self, gaps: List[Dict], filename: str):
         """Export results to JSON"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(gaps, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(gaps, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(gaps, f, indent=2, ensure_ascii=False)
 
         print(f"\nExported {len(gaps)} opportunities to: {filename}")
 
@@ -290,15 +488,30 @@ class AEOContentGapAnalyzer:
             print("\nNo opportunities found")
             return
 
-        print(f"\nTOP {min(top_n, len(gaps))} AEO OPPORTUNITIES")
+        # Build the whole report and write it once rather than print per line
+        lines = ["", f"TOP {min(top_n, len(gaps))} AEO OPPORTUNITIES"]
+        append = lines.append
+
+        # Pull every printed field out of the row dicts in one pass
+        rows = [
+            (kw["keyword"], kw["volume"], kw["difficulty"], kw["aeo_score"],
+             kw["intent"], kw["word_count"], kw["competitor"],
+             kw.get("has_aeo_features"), kw.get("aeo_serp_features"),
+             kw.get("cpc", 0), kw.get("competition", 0))
+            for kw in gaps[:top_n]
+        ]
+
+        for i, (keyword, volume, difficulty, aeo_score, intent, word_count, competitor,
+                has_aeo_features, aeo_serp_features, cpc, competition) in enumerate(rows, 1):
+            append("")
+            append(f"{i}. {keyword}")
+            append(f"   Volume: {volume:,}/mo | Difficulty: {difficulty} | AEO Score: {aeo_score}")
+            append(f"   Intent: {intent.upper()} | Words: {word_count} | Competitor: {competitor}")
 
-        for i, kw in enumerate(gaps[:top_n], 1):
-            print(f"\n{i}. {kw['keyword']}")
-            print(f"   Volume: {kw['volume']:,}/mo | Difficulty: {kw['difficulty']} | AEO Score: {kw['aeo_score']}")
-            print(f"   Intent: {kw['intent'].upper()} | Words: {kw['word_count']} | Competitor: {kw['competitor']}")
+            if has_aeo_features:
+                append(f"   SERP Features: {', '.join(aeo_serp_features)}")
 
-            if kw.get('has_aeo_features'):
-                print(f"   SERP Features: {', '.join(kw['aeo_serp_features'])}")
+            if cpc > 0:
+                append(f"   CPC: ${cpc:.2f} | Competition: {competition:.2f}")
 
-            if kw.get('cpc', 0) > 0:
-                print(f"   CPC: ${kw['cpc']:.2f} | Competition: {kw['competition']:.2f}")
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -183,6 +183,20 @@ class KeywordGenerator:
             processing_time_seconds=processing_time,
         )
 
+    async def generate_batch(
+        self,
+        jobs: list[tuple[CompanyInfo, Optional[GenerationConfig]]],
+        concurrency: int = 4,
+    ) -> list[GenerationResult]:
+        """Run generate() for several (company, config) pairs concurrently, in input order."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _run(company_info: CompanyInfo, config: Optional[GenerationConfig]):
+            async with semaphore:
+                return await self.generate(company_info, config)
+
+        return await asyncio.gather(*(_run(company, config) for company, config in jobs))
+
     async def _get_gap_keywords(
         self, company_info: CompanyInfo, config: GenerationConfig
     ) -> list[dict]:
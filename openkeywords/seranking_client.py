@@ -64,7 +64,8 @@ class SEORankingAPIClient:
         competitors: Optional[List[str]] = None,
         source: str = "us",
         max_competitors: int = 3,
-        filters: Optional[Dict] = None
+        filters: Optional[Dict] = None,
+        max_pages: int = 1
     ) -> List[Dict]:
         """
         Analyze content gaps for AEO opportunities.
@@ -75,6 +76,7 @@ class SEORankingAPIClient:
             source: Region code
             max_competitors: Max competitors if auto-detecting
             filters: Custom AEO filters
+            max_pages: Max comparison pages (one billable request each) per competitor
 
         Returns:
             List of gap keywords with AEO scores
@@ -93,7 +95,8 @@ class SEORankingAPIClient:
                 domain=domain,
                 competitors=competitors,
                 source=source,
-                max_competitors=len(competitors)
+                max_competitors=len(competitors),
+                max_pages=max_pages
             )
 
             # Apply custom filters if provided
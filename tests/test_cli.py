@@ -72,6 +72,15 @@ class TestCLIGenerate:
         assert "--industry" in result.output
         assert "--count" in result.output
 
+    def test_generate_rejects_unknown_log_level(self):
+        """Test --log-level only accepts known levels"""
+        runner = CliRunner()
+
+        result = runner.invoke(generate, ["--company", "TestCorp", "--log-level", "LOUD"])
+
+        assert result.exit_code != 0
+        assert "--log-level" in result.output
+
     def test_generate_requires_company(self):
         """Test generate requires --company"""
         runner = CliRunner()
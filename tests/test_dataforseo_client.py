@@ -0,0 +1,464 @@
+"""
+Tests for DataForSEOClient
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import httpx
+
+from openkeywords import dataforseo_client
+from openkeywords.dataforseo_client import (
+    DataForSEOClient,
+    SearchResult,
+    SerpResponse,
+    _RateLimiter,
+    close_shared_clients,
+    search_serp,
+)
+
+
+def serp_payload(items):
+    """Build a minimal DataForSEO SERP response body"""
+    return {"tasks": [{"status_code": 20000, "result": [{"items": items}]}]}
+
+
+@pytest.fixture
+def make_client():
+    """Create a configured client whose HTTP pool is backed by a mock transport"""
+
+    def _make(handler):
+        client = DataForSEOClient(login="user", password="pass")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._client_loop = asyncio.get_running_loop()
+        return client
+
+    return _make
+
+
+class TestSerpResponse:
+    """Tests for SerpResponse serialization"""
+
+    def test_to_dict(self):
+        """Test nested results are exported as plain dicts"""
+        response = SerpResponse(
+            success=True,
+            query="test",
+            results=[SearchResult(1, "Title", "https://a.com", "snippet")],
+        )
+        data = response.to_dict()
+
+        assert data["query"] == "test"
+        assert data["results"][0] == {
+            "position": 1,
+            "title": "Title",
+            "link": "https://a.com",
+            "snippet": "snippet",
+            "displayed_link": "",
+        }
+        assert data["cached"] is False
+        assert data["timestamp"] == response.timestamp
+        assert "timestamp_ns" not in data
+
+    def test_timestamp_is_utc_iso(self):
+        """Test the timestamp property formats the stored nanoseconds"""
+        response = SerpResponse(success=True, query="test", timestamp_ns=1_700_000_000_000_000_000)
+
+        assert response.timestamp == "2023-11-14T22:13:20+00:00"
+
+    def test_to_json_bytes_matches_to_dict(self):
+        """Test JSON export round-trips to the same dict"""
+        response = SerpResponse(
+            success=True,
+            query="test",
+            results=[SearchResult(1, "Title", "https://a.com", "snippet")],
+            people_also_ask=[{"question": "Why?"}],
+        )
+
+        assert json.loads(response.to_json_bytes()) == response.to_dict()
+
+
+class TestRateLimiter:
+    """Tests for the client-side token bucket"""
+
+    @pytest.mark.asyncio
+    async def test_burst_within_capacity(self):
+        """Test acquisitions up to the bucket size do not wait"""
+        limiter = _RateLimiter(max_rate=5, time_period=60.0)
+        start = time.monotonic()
+        for _ in range(5):
+            async with limiter:
+                pass
+
+        assert time.monotonic() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_waits_when_exhausted(self):
+        """Test acquisitions beyond the bucket size are paced"""
+        limiter = _RateLimiter(max_rate=2, time_period=0.1)
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+
+        assert time.monotonic() - start >= 0.09
+
+
+class TestClientLifecycle:
+    """Tests for the pooled HTTP client"""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused(self):
+        """Test the pooled client is created once and reused"""
+        client = DataForSEOClient(login="user", password="pass")
+        first = await client._get_client()
+        second = await client._get_client()
+
+        assert first is second
+        assert first.headers["Authorization"] == client._get_auth_header()
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_client(self):
+        """Test exiting the context manager releases the pool"""
+        async with DataForSEOClient(login="user", password="pass") as client:
+            http_client = await client._get_client()
+
+        assert http_client.is_closed
+        assert client._client is None
+
+    def test_pool_rebuilt_for_new_event_loop(self):
+        """Test a client reused across asyncio.run calls gets a fresh pool"""
+        client = DataForSEOClient(login="user", password="pass")
+        first = asyncio.run(client._get_client())
+        second = asyncio.run(client._get_client())
+
+        assert first is not second
+        assert first.is_closed
+
+    def test_concurrent_rebuild_after_event_loop_changed(self, monkeypatch):
+        """Test concurrent callers on a new loop share one fresh pool and none leak"""
+        created = []
+        real_init = httpx.AsyncClient.__init__
+        real_aclose = httpx.AsyncClient.aclose
+
+        def tracking_init(self, *args, **kwargs):
+            real_init(self, *args, **kwargs)
+            created.append(self)
+
+        async def yielding_aclose(self):
+            # Real pools yield while closing open connections
+            await asyncio.sleep(0)
+            await real_aclose(self)
+
+        monkeypatch.setattr(httpx.AsyncClient, "__init__", tracking_init)
+        monkeypatch.setattr(httpx.AsyncClient, "aclose", yielding_aclose)
+
+        client = DataForSEOClient(login="user", password="pass")
+        asyncio.run(client._get_client())
+
+        async def fan_out():
+            return await asyncio.gather(*(client._get_client() for _ in range(5)))
+
+        handed_out = asyncio.run(fan_out())
+        asyncio.run(client.aclose())
+
+        assert len(created) == 2
+        assert len({id(c) for c in handed_out}) == 1
+        assert all(c.is_closed for c in created)
+
+    def test_close_after_event_loop_changed(self):
+        """Test aclose releases a client opened under a previous event loop"""
+        client = DataForSEOClient(login="user", password="pass")
+        http_client = asyncio.run(client._get_client())
+        asyncio.run(client.aclose())
+
+        assert http_client.is_closed
+        assert client._client is None
+
+
+class TestSearchSerp:
+    """Tests for the search_serp convenience function"""
+
+    @pytest.mark.asyncio
+    async def test_shares_client_per_credentials(self, monkeypatch):
+        """Test repeated calls reuse one client per credential pair"""
+        seen = []
+
+        async def fake_search(self, query, **kwargs):
+            seen.append(self)
+            return SerpResponse(success=True, query=query)
+
+        monkeypatch.setattr(DataForSEOClient, "search", fake_search)
+
+        await search_serp("a", login="user", password="pass")
+        await search_serp("b", login="user", password="pass")
+        await search_serp("c", login="other", password="pass")
+
+        assert seen[0] is seen[1]
+        assert seen[0] is not seen[2]
+
+        await close_shared_clients()
+        assert dataforseo_client._shared_clients == {}
+
+
+class TestSearch:
+    """Tests for SERP search"""
+
+    @pytest.mark.asyncio
+    async def test_search_not_configured(self, monkeypatch):
+        """Test search without credentials fails fast"""
+        monkeypatch.delenv("DATAFORSEO_LOGIN", raising=False)
+        monkeypatch.delenv("DATAFORSEO_PASSWORD", raising=False)
+        client = DataForSEOClient()
+
+        response = await client.search("test query")
+
+        assert response.success is False
+        assert "not configured" in response.error
+
+    @pytest.mark.asyncio
+    async def test_search_parses_features(self, make_client):
+        """Test organic results and SERP features are parsed"""
+        items = [
+            {"type": "featured_snippet", "title": "FS", "description": "snip", "url": "https://a.com"},
+            {"type": "organic", "rank_absolute": 1, "title": "A", "url": "https://a.com",
+             "description": "desc", "breadcrumb": "a.com"},
+            {"type": "people_also_ask", "items": [{"title": "What is A?"}]},
+            {"type": "related_searches", "items": ["a vs b", {"title": "a pricing"}]},
+        ]
+
+        def handler(request):
+            return httpx.Response(200, json=serp_payload(items))
+
+        client = make_client(handler)
+        response = await client.search("what is a")
+
+        assert response.success is True
+        assert response.total_results == 1
+        assert response.results[0].link == "https://a.com"
+        assert response.featured_snippet["snippet"] == "snip"
+        assert response.people_also_ask[0]["question"] == "What is A?"
+        assert [r["query"] for r in response.related_searches] == ["a vs b", "a pricing"]
+
+    @pytest.mark.asyncio
+    async def test_search_many_preserves_order(self, make_client):
+        """Test concurrent searches return one response per query, in order"""
+        def handler(request):
+            keyword = json.loads(request.content)[0]["keyword"]
+            return httpx.Response(200, json=serp_payload(
+                [{"type": "organic", "rank_absolute": 1, "title": keyword, "url": "https://a.com"}]
+            ))
+
+        client = make_client(handler)
+        queries = [f"query {i}" for i in range(10)]
+        responses = await client.search_many(queries, concurrency=3)
+
+        assert [r.query for r in responses] == queries
+        assert [r.results[0].title for r in responses] == queries
+
+    @pytest.mark.asyncio
+    async def test_search_uses_cache(self, make_client):
+        """Test repeated searches are served from the cache"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=serp_payload([]))
+
+        client = make_client(handler)
+        first = await client.search("cached query")
+        second = await client.search("cached query")
+        other_market = await client.search("cached query", country="de")
+
+        assert len(calls) == 2
+        assert first.cached is False
+        assert second.cached is True
+        assert second.cost == 0.0
+        assert other_market.cached is False
+
+    @pytest.mark.asyncio
+    async def test_search_cache_isolated_from_callers(self, make_client):
+        """Test mutating a returned response does not change later cache hits"""
+        def handler(request):
+            return httpx.Response(200, json=serp_payload(
+                [{"type": "organic", "rank_absolute": 1, "title": "A", "url": "https://a.com"}]
+            ))
+
+        client = make_client(handler)
+        first = await client.search("cached query")
+        first.results.clear()
+        second = await client.search("cached query")
+        second.results[0].title = "changed"
+        third = await client.search("cached query")
+
+        assert [r.title for r in third.results] == ["A"]
+
+    @pytest.mark.asyncio
+    async def test_search_cache_disabled(self, make_client):
+        """Test a zero TTL disables caching"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=serp_payload([]))
+
+        client = make_client(handler)
+        client.cache_ttl = 0
+        await client.search("query")
+        await client.search("query")
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_retries_transient_errors(self, make_client):
+        """Test 5xx responses are retried before giving up"""
+        statuses = iter([503, 429, 200])
+
+        def handler(request):
+            status = next(statuses)
+            return httpx.Response(status, json=serp_payload([]))
+
+        client = make_client(handler)
+        response = await client.search("flaky query")
+
+        assert response.success is True
+
+    @pytest.mark.asyncio
+    async def test_search_does_not_retry_client_errors(self, make_client):
+        """Test non-transient 4xx responses fail without retrying"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400)
+
+        client = make_client(handler)
+        response = await client.search("bad query")
+
+        assert response.success is False
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_search_auth_failure(self, make_client):
+        """Test 401 responses are reported as auth failures"""
+        client = make_client(lambda request: httpx.Response(401))
+        response = await client.search("test")
+
+        assert response.success is False
+        assert response.error == "DataForSEO authentication failed"
+
+
+class TestKeywordData:
+    """Tests for keyword volume and difficulty lookups"""
+
+    @pytest.mark.asyncio
+    async def test_get_keyword_data(self, make_client):
+        """Test volume data is keyed by lowercase keyword"""
+        body = {"tasks": [{"status_code": 20000, "result": [
+            {"keyword": "Project Software", "search_volume": 1200, "cpc": 3.5,
+             "competition": 0.4, "competition_level": "MEDIUM"},
+            {"keyword": "task app", "search_volume": None, "cpc": None,
+             "competition": None, "competition_level": None},
+        ]}]}
+        client = make_client(lambda request: httpx.Response(200, json=body))
+
+        data = await client.get_keyword_data(["Project Software", "task app"])
+
+        assert data["project software"]["volume"] == 1200
+        assert data["project software"]["difficulty"] == 50
+        assert data["task app"]["volume"] == 0
+        assert data["task app"]["competition"] == 0.0
+        assert data["task app"]["competition_level"] == ""
+        assert data["task app"]["difficulty"] == 50
+
+    @pytest.mark.asyncio
+    async def test_get_keyword_data_columns(self, make_client):
+        """Test columnar keyword data is aligned with the deduplicated input"""
+        body = {"tasks": [{"status_code": 20000, "result": [
+            {"keyword": "crm software", "search_volume": 900, "cpc": 2.5,
+             "competition": 0.3, "competition_level": "LOW"},
+        ]}]}
+        client = make_client(lambda request: httpx.Response(200, json=body))
+
+        columns = await client.get_keyword_data_columns(["CRM Software", "crm software", "task app"])
+
+        assert columns["keywords"] == ["crm software", "task app"]
+        assert list(columns["volume"]) == [900, 0]
+        assert list(columns["cpc"]) == [2.5, 0.0]
+        assert list(columns["competition"]) == [0.3, 0.0]
+        assert list(columns["difficulty"]) == [25, 50]
+
+    @pytest.mark.asyncio
+    async def test_get_keyword_data_columns_not_configured(self, monkeypatch):
+        """Test an unconfigured client yields all-default columns"""
+        monkeypatch.delenv("DATAFORSEO_LOGIN", raising=False)
+        monkeypatch.delenv("DATAFORSEO_PASSWORD", raising=False)
+        client = DataForSEOClient()
+
+        columns = await client.get_keyword_data_columns(["crm", "task app"])
+
+        assert list(columns["volume"]) == [0, 0]
+        assert list(columns["cpc"]) == [0.0, 0.0]
+        assert list(columns["competition"]) == [0.0, 0.0]
+        assert list(columns["difficulty"]) == [50, 50]
+
+    @pytest.mark.asyncio
+    async def test_get_keyword_difficulty(self, make_client):
+        """Test difficulty scores are returned per keyword"""
+        body = {"tasks": [{"status_code": 20000, "result": [
+            {"keyword": "project software", "keyword_difficulty": 42},
+        ]}]}
+        client = make_client(lambda request: httpx.Response(200, json=body))
+
+        data = await client.get_keyword_difficulty(["project software"])
+
+        assert data == {"project software": 42}
+
+    @pytest.mark.asyncio
+    async def test_keywords_deduplicated_before_posting(self, make_client):
+        """Test case-insensitive duplicates are sent once"""
+        sent = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            sent.extend(payload[0]["keywords"] if "keywords" in payload[0]
+                        else [t["keyword"] for t in payload])
+            return httpx.Response(200, json={"tasks": []})
+
+        client = make_client(handler)
+        keywords = ["CRM Software", "crm software", "task app", "Task App"]
+        await client.get_keyword_data(keywords)
+        await client.get_keyword_difficulty(keywords)
+
+        assert sent == ["crm software", "task app"] * 2
+
+    @pytest.mark.asyncio
+    async def test_get_keyword_difficulty_chunks(self, make_client):
+        """Test difficulty lookups are split into chunked requests and merged"""
+        chunk_sizes = []
+
+        def handler(request):
+            tasks = json.loads(request.content)
+            chunk_sizes.append(len(tasks))
+            result = [{"keyword": t["keyword"], "keyword_difficulty": 10} for t in tasks]
+            return httpx.Response(200, json={"tasks": [{"status_code": 20000, "result": result}]})
+
+        client = make_client(handler)
+        keywords = [f"keyword {i}" for i in range(25)]
+        data = await client.get_keyword_difficulty(keywords, chunk_size=10)
+
+        assert sorted(chunk_sizes) == [5, 10, 10]
+        assert len(data) == 25
+
+    @pytest.mark.asyncio
+    async def test_empty_keywords(self, make_client):
+        """Test empty keyword lists skip the API call"""
+        def handler(request):
+            raise AssertionError("API should not be called")
+
+        client = make_client(handler)
+
+        assert await client.get_keyword_data([]) == {}
+        assert await client.get_keyword_difficulty([]) == {}
@@ -0,0 +1,493 @@
+"""
+Tests for the AEO content gap analyzer
+"""
+
+import csv
+import json
+import logging
+import threading
+
+import pytest
+import requests
+from unittest.mock import MagicMock
+
+from openkeywords import AEOContentGapAnalyzer, SEORankingAPI
+from openkeywords.seranking_client import SEORankingAPIClient
+
+
+def make_gap(keyword, volume=500, difficulty=20, competition=0.1, **extra):
+    """Build a keyword row shaped like the SE Ranking comparison API"""
+    return {
+        "keyword": keyword,
+        "volume": volume,
+        "difficulty": difficulty,
+        "competition": competition,
+        **extra,
+    }
+
+
+@pytest.fixture
+def analyzer():
+    """Analyzer backed by a mocked SE Ranking API"""
+    return AEOContentGapAnalyzer(MagicMock())
+
+
+class TestSEORankingAPI:
+    """Tests for the SE Ranking HTTP client"""
+
+    def test_session_configured(self):
+        """Test the session carries auth headers and a pooled, retrying adapter"""
+        api = SEORankingAPI("test-key")
+        adapter = api.session.get_adapter("https://api.seranking.com/v1")
+
+        assert api.session.headers["Authorization"] == "Token test-key"
+        assert adapter.max_retries.total == 3
+        assert 429 in adapter.max_retries.status_forcelist
+
+    def test_get_keyword_comparison_uses_session(self):
+        """Test requests go through the shared session"""
+        api = SEORankingAPI("test-key")
+        api.session = MagicMock()
+        api.session.get.return_value.content = b'[{"keyword": "crm"}]'
+
+        result = api.get_keyword_comparison("me.com", "them.com")
+
+        assert result == [{"keyword": "crm"}]
+        args, kwargs = api.session.get.call_args
+        assert args[0].endswith("/domain/keywords/comparison")
+        assert kwargs["params"]["compare"] == "them.com"
+
+    def test_invalid_json_returns_empty(self):
+        """Test a non-JSON body is treated like a failed request"""
+        api = SEORankingAPI("test-key")
+        api.session = MagicMock()
+        api.session.get.return_value.content = b"<html>Service unavailable</html>"
+
+        assert api.get_competitors("me.com") == []
+        assert api.get_keyword_comparison("me.com", "them.com") == []
+
+    def test_keyword_comparison_paginates(self):
+        """Test full pages trigger further fetches that stop at the first short page"""
+        api = SEORankingAPI("test-key")
+        api.session = MagicMock()
+        pages = {0: b'[{"keyword": "a"}, {"keyword": "b"}]',
+                 2: b'[{"keyword": "c"}, {"keyword": "d"}]',
+                 4: b'[{"keyword": "e"}, {"keyword": "f"}]',
+                 6: b'[{"keyword": "g"}]'}
+
+        def get(url, params, timeout):
+            response = MagicMock()
+            response.content = pages.get(params["offset"], b"[]")
+            return response
+
+        api.session.get.side_effect = get
+
+        result = api.get_keyword_comparison("me.com", "them.com", limit=2, max_pages=10)
+
+        assert [r["keyword"] for r in result] == ["a", "b", "c", "d", "e", "f", "g"]
+        offsets = sorted(c.kwargs["params"]["offset"] for c in api.session.get.call_args_list)
+        assert offsets == [0, 2, 4, 6]
+
+    def test_keyword_comparison_short_second_page(self):
+        """Test a short second page stops pagination without further requests"""
+        api = SEORankingAPI("test-key")
+        api.session = MagicMock()
+        pages = {0: b'[{"keyword": "a"}, {"keyword": "b"}]', 2: b'[{"keyword": "c"}]'}
+
+        def get(url, params, timeout):
+            response = MagicMock()
+            response.content = pages.get(params["offset"], b"[]")
+            return response
+
+        api.session.get.side_effect = get
+
+        result = api.get_keyword_comparison("me.com", "them.com", limit=2, max_pages=5)
+
+        assert [r["keyword"] for r in result] == ["a", "b", "c"]
+        assert api.session.get.call_count == 2
+
+    def test_keyword_comparison_single_page_by_default(self):
+        """Test only one billable request is made unless more pages are asked for"""
+        api = SEORankingAPI("test-key")
+        api.session = MagicMock()
+        api.session.get.return_value.content = b'[{"keyword": "a"}, {"keyword": "b"}]'
+
+        api.get_keyword_comparison("me.com", "them.com", limit=2)
+
+        assert api.session.get.call_count == 1
+
+    def test_keyword_comparison_short_first_page(self):
+        """Test a partial first page is returned without further requests"""
+        api = SEORankingAPI("test-key")
+        api.session = MagicMock()
+        api.session.get.return_value.content = b'[{"keyword": "crm"}]'
+
+        api.get_keyword_comparison("me.com", "them.com", limit=2)
+
+        assert api.session.get.call_count == 1
+
+    def test_request_error_returns_empty(self):
+        """Test request failures are swallowed into an empty result"""
+        api = SEORankingAPI("test-key")
+        api.session = MagicMock()
+        api.session.get.side_effect = requests.exceptions.ConnectionError("down")
+
+        assert api.get_competitors("me.com") == []
+
+
+class TestFilterLongtail:
+    """Tests for long-tail AEO filtering"""
+
+    def test_filters_by_thresholds(self, analyzer):
+        """Test volume, difficulty, competition and word-count filters"""
+        gaps = [
+            make_gap("how to manage remote teams"),
+            make_gap("two words"),
+            make_gap("low volume keyword here", volume=50),
+            make_gap("too hard keyword here", difficulty=60),
+            make_gap("too competitive keyword here", competition=0.9),
+        ]
+
+        longtail = analyzer.filter_longtail_aeo(gaps)
+
+        assert [kw["keyword"] for kw in longtail] == ["how to manage remote teams"]
+        assert longtail[0]["word_count"] == 5
+
+    def test_keeps_all_fields(self, analyzer):
+        """Test filtering keeps every field of the input rows, including scores"""
+        row = make_gap("how to manage remote teams", aeo_score=42.0, intent="question",
+                       competitor="a.com", traffic=40)
+
+        longtail = analyzer.filter_longtail_aeo([row])
+
+        assert longtail[0]["aeo_score"] == 42.0
+        assert longtail[0]["intent"] == "question"
+        assert longtail[0]["competitor"] == "a.com"
+        assert longtail[0]["traffic"] == 40
+        assert longtail[0]["word_count"] == 5
+
+    def test_iter_longtail_is_lazy(self, analyzer):
+        """Test the streaming filter consumes rows only as it is iterated"""
+        rows = iter([make_gap("how to manage remote teams"), make_gap("how to plan sprints well")])
+
+        stream = analyzer.iter_longtail_aeo(rows)
+
+        assert next(stream)["keyword"] == "how to manage remote teams"
+        assert next(rows)["keyword"] == "how to plan sprints well"
+
+    def test_custom_filters(self, analyzer):
+        """Test custom filter thresholds"""
+        filters = {
+            "min_volume": 0,
+            "max_volume": 100,
+            "max_difficulty": 100,
+            "max_competition": 1,
+            "min_words": 1,
+        }
+
+        longtail = analyzer.filter_longtail_aeo([make_gap("crm", volume=10)], filters)
+
+        assert len(longtail) == 1
+
+
+class TestScoring:
+    """Tests for intent, SERP feature and AEO score calculation"""
+
+    def test_categorize_question_intent(self, analyzer):
+        """Test question keywords get the question multiplier"""
+        kw = analyzer.categorize_by_intent(make_gap("how to write a project plan"))
+
+        assert kw["intent"] == "question"
+        assert kw["intent_multiplier"] == 1.5
+
+    def test_categorize_multiple_intents(self, analyzer):
+        """Test all matching intents are recorded and the highest multiplier wins"""
+        kw = analyzer.categorize_by_intent(make_gap("best tips for remote teams"))
+
+        assert kw["matched_intents"] == ["commercial", "informational"]
+        assert kw["intent"] == "informational"
+        assert kw["intent_multiplier"] == 1.4
+
+    def test_categorize_question_without_leading_word(self, analyzer):
+        """Test question words later in the keyword still match"""
+        kw = analyzer.categorize_by_intent(make_gap("crm cost what to expect"))
+
+        assert kw["matched_intents"] == ["question", "commercial"]
+        assert kw["intent"] == "question"
+
+    def test_categorize_results_not_shared(self, analyzer):
+        """Test cached intent matches hand out independent lists"""
+        first = analyzer.categorize_by_intent(make_gap("best crm guide"))
+        first["matched_intents"].append("mutated")
+        second = analyzer.categorize_by_intent(make_gap("best crm guide"))
+
+        assert second["matched_intents"] == ["commercial", "informational"]
+
+    def test_categorize_other_intent(self, analyzer):
+        """Test keywords without patterns fall back to other"""
+        kw = analyzer.categorize_by_intent(make_gap("zzz"))
+
+        assert kw["intent"] == "other"
+        assert kw["intent_multiplier"] == 1.0
+        assert kw["matched_intents"] == []
+
+    def test_aeo_serp_features(self, analyzer):
+        """Test AEO-friendly SERP features boost the score"""
+        kw = analyzer.check_aeo_serp_features(
+            make_gap("what is crm", serp_features=["faq", "images", "featured_snippet"])
+        )
+
+        assert kw["aeo_serp_features"] == ["faq", "featured_snippet"]
+        assert kw["has_aeo_features"] is True
+        assert kw["aeo_feature_boost"] == 1.3
+
+    def test_calculate_aeo_score(self, analyzer):
+        """Test AEO score formula"""
+        kw = make_gap("x", volume=1000, difficulty=9, intent_multiplier=1.5, aeo_feature_boost=1.3)
+
+        score = analyzer.calculate_aeo_score(kw)
+
+        assert score == pytest.approx(195.0)
+        assert kw["aeo_score"] == 195.0
+
+    def test_score_row_matches_separate_steps(self, analyzer):
+        """Test the fused scorer matches the three individual scoring steps"""
+        row = make_gap("how to compare crm tools", serp_features=["people_also_ask"])
+        expected = dict(row, competitor="a.com")
+        analyzer.categorize_by_intent(expected)
+        analyzer.check_aeo_serp_features(expected)
+        analyzer.calculate_aeo_score(expected)
+
+        assert analyzer._score_row(dict(row), "a.com") == expected
+
+
+class TestAnalyzeContentGaps:
+    """Tests for the end-to-end gap analysis"""
+
+    def test_analyze_multiple_competitors(self, analyzer):
+        """Test gaps from all competitors are scored and sorted"""
+        rows = {
+            "a.com": [make_gap("how to plan a project", volume=1000)],
+            "b.com": [make_gap("best project planning tools", volume=200)],
+        }
+        analyzer.api.get_keyword_comparison.side_effect = (
+            lambda domain, competitor, source, **kwargs: [dict(r) for r in rows[competitor]]
+        )
+
+        gaps = analyzer.analyze_content_gaps("me.com", competitors=["a.com", "b.com"])
+
+        assert [g["competitor"] for g in gaps] == ["a.com", "b.com"]
+        assert gaps[0]["aeo_score"] >= gaps[1]["aeo_score"]
+
+    def test_drops_unused_fields(self, analyzer):
+        """Test scored gaps keep only the fields used downstream plus scoring output"""
+        analyzer.api.get_keyword_comparison.return_value = [
+            make_gap("how to manage remote teams", cpc=1.2, serp_features=["faq"],
+                     traffic=40, prev_position=7)
+        ]
+
+        gaps = analyzer.analyze_content_gaps("me.com", competitors=["a.com"])
+
+        assert "traffic" not in gaps[0]
+        assert "prev_position" not in gaps[0]
+        assert gaps[0]["word_count"] == 5
+        assert gaps[0]["competitor"] == "a.com"
+
+    def test_max_pages_paginates(self):
+        """Test a full first page triggers a second fetch when max_pages allows it"""
+        api = SEORankingAPI("test-key")
+        api.session = MagicMock()
+        first_page = json.dumps(
+            [make_gap(f"how to plan project {i}") for i in range(1000)]
+        ).encode()
+        second_page = json.dumps([make_gap("how to plan the last project")]).encode()
+
+        def get(url, params, timeout):
+            response = MagicMock()
+            response.content = first_page if params["offset"] == 0 else second_page
+            return response
+
+        api.session.get.side_effect = get
+
+        gaps = AEOContentGapAnalyzer(api).analyze_content_gaps(
+            "me.com", competitors=["a.com"], max_pages=2
+        )
+
+        assert len(gaps) == 1001
+        offsets = sorted(c.kwargs["params"]["offset"] for c in api.session.get.call_args_list)
+        assert offsets == [0, 1000]
+
+    def test_top_n(self, analyzer):
+        """Test top_n returns only the highest-scoring opportunities in order"""
+        rows = [make_gap(f"how to plan project {i}", volume=100 + i) for i in range(40)]
+        analyzer.api.get_keyword_comparison.return_value = rows
+
+        gaps = analyzer.analyze_content_gaps("me.com", competitors=["a.com"], top_n=3)
+
+        assert [g["volume"] for g in gaps] == [139, 138, 137]
+
+    def test_progress_is_logged(self, analyzer, caplog, capsys):
+        """Test progress goes to the module logger instead of stdout"""
+        analyzer.api.get_keyword_comparison.return_value = [make_gap("how to plan a project")]
+
+        with caplog.at_level(logging.INFO, logger="openkeywords.gap_analyzer"):
+            analyzer.analyze_content_gaps("me.com", competitors=["a.com"])
+
+        assert "[1/1] Comparing with a.com..." in caplog.messages
+        assert "Total AEO opportunities found: 1" in caplog.messages
+        assert capsys.readouterr().out == ""
+
+    def test_competitor_fetches_run_concurrently(self, analyzer):
+        """Test comparisons for different competitors are in flight together"""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fetch(domain, competitor, source, **kwargs):
+            barrier.wait()
+            return []
+
+        analyzer.api.get_keyword_comparison.side_effect = fetch
+
+        gaps = analyzer.analyze_content_gaps("me.com", competitors=["a.com", "b.com", "c.com"])
+
+        assert gaps == []
+
+    def test_no_competitors(self, analyzer):
+        """Test auto-detection returning nothing yields no gaps"""
+        analyzer.api.get_competitors.return_value = []
+
+        assert analyzer.analyze_content_gaps("me.com") == []
+
+
+class TestSEORankingAPIClient:
+    """Tests for the gap analysis wrapper used by the generator"""
+
+    def test_custom_filters_keep_scores(self):
+        """Test re-filtering scored gaps with custom filters keeps the scoring output"""
+        client = SEORankingAPIClient(api_key="test-key")
+        client.analyzer.api = MagicMock()
+        client.analyzer.api.get_keyword_comparison.return_value = [
+            make_gap("how to plan a project", volume=1000)
+        ]
+        filters = {
+            "min_volume": 0,
+            "max_volume": 10000,
+            "max_difficulty": 50,
+            "max_competition": 1,
+            "min_words": 3,
+        }
+
+        gaps = client.analyze_content_gaps("me.com", competitors=["a.com"], filters=filters)
+
+        assert len(gaps) == 1
+        assert gaps[0]["aeo_score"] > 0
+        assert gaps[0]["intent"] == "question"
+        assert gaps[0]["competitor"] == "a.com"
+
+    def test_forwards_max_pages(self):
+        """Test max_pages reaches the keyword comparison fetch"""
+        client = SEORankingAPIClient(api_key="test-key")
+        client.analyzer.api = MagicMock()
+        client.analyzer.api.get_keyword_comparison.return_value = []
+
+        client.analyze_content_gaps("me.com", competitors=["a.com"], max_pages=3)
+
+        _, kwargs = client.analyzer.api.get_keyword_comparison.call_args
+        assert kwargs["max_pages"] == 3
+
+
+class TestExport:
+    """Tests for CSV and JSON export"""
+
+    def test_export_confirmation_printed(self, analyzer, tmp_path, capsys):
+        """Test export confirmations stay visible regardless of log level"""
+        path = tmp_path / "gaps.json"
+
+        analyzer.export_to_json([{"keyword": "crm"}], str(path))
+
+        assert f"Exported 1 opportunities to: {path}" in capsys.readouterr().out
+
+    def test_export_to_csv(self, analyzer, tmp_path):
+        """Test CSV export fills missing columns and joins SERP features"""
+        gaps = [make_gap("what is crm", aeo_score=12.5,
+                         aeo_serp_features=["faq", "featured_snippet"], extra="ignored")]
+        path = tmp_path / "gaps.csv"
+
+        analyzer.export_to_csv(gaps, str(path))
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 1
+        assert rows[0]["keyword"] == "what is crm"
+        assert rows[0]["aeo_serp_features"] == "faq;featured_snippet"
+        assert rows[0]["url"] == ""
+        assert "extra" not in rows[0]
+
+    def test_export_to_json(self, analyzer, tmp_path):
+        """Test JSON export round-trips non-ASCII keywords"""
+        gaps = [{"keyword": "günstige projektsoftware", "aeo_score": 12.5}]
+        path = tmp_path / "gaps.json"
+
+        analyzer.export_to_json(gaps, str(path))
+
+        assert json.loads(path.read_text(encoding="utf-8")) == gaps
+
+
+class TestPrintTopOpportunities:
+    """Tests for the console report"""
+
+    def test_prints_top_rows(self, analyzer, capsys):
+        """Test the report lists the top rows with optional feature and CPC lines"""
+        gaps = [
+            make_gap("how to plan a project", volume=1200, aeo_score=30.5, intent="question",
+                     word_count=5, competitor="a.com", has_aeo_features=True,
+                     aeo_serp_features=["faq", "sge"], cpc=1.5),
+            make_gap("project plan template ideas", aeo_score=10.0, intent="informational",
+                     word_count=4, competitor="b.com", has_aeo_features=False,
+                     aeo_serp_features=[]),
+        ]
+
+        analyzer.print_top_opportunities(gaps, top_n=1)
+
+        out = capsys.readouterr().out
+        assert "TOP 1 AEO OPPORTUNITIES" in out
+        assert "1. how to plan a project" in out
+        assert "Volume: 1,200/mo | Difficulty: 20 | AEO Score: 30.5" in out
+        assert "Intent: QUESTION | Words: 5 | Competitor: a.com" in out
+        assert "SERP Features: faq, sge" in out
+        assert "CPC: $1.50 | Competition: 0.10" in out
+        assert "project plan template ideas" not in out
+
+    def test_no_gaps(self, analyzer, capsys):
+        """Test an empty result prints a notice"""
+        analyzer.print_top_opportunities([])
+
+        assert "No opportunities found" in capsys.readouterr().out
+
+
+class TestSummaryStats:
+    """Tests for summary statistics"""
+
+    def test_summary_stats(self, analyzer):
+        """Test summary statistics over scored gaps"""
+        gaps = [
+            {"intent": "question", "has_aeo_features": True, "aeo_score": 10.0,
+             "volume": 100, "difficulty": 10},
+            {"intent": "commercial", "has_aeo_features": False, "aeo_score": 20.0,
+             "volume": 300, "difficulty": 20},
+        ]
+
+        stats = analyzer.generate_summary_stats(gaps)
+
+        assert stats == {
+            "total_opportunities": 2,
+            "intent_breakdown": {"question": 1, "commercial": 1},
+            "with_aeo_serp_features": 1,
+            "question_keywords": 1,
+            "avg_aeo_score": 15.0,
+            "avg_volume": 200,
+            "avg_difficulty": 15.0,
+        }
+
+    def test_summary_stats_empty(self, analyzer):
+        """Test empty input returns empty stats"""
+        assert analyzer.generate_summary_stats([]) == {}
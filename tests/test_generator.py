@@ -107,6 +107,28 @@ class TestGeneratorGenerate:
         assert result.keywords == []
         assert result.statistics.total == 0
 
+    @pytest.mark.asyncio
+    async def test_generate_batch(self, mock_generator, sample_config):
+        """Test batch generation runs jobs concurrently and keeps input order"""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_generate(company_info, config=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return company_info.name
+
+        mock_generator.generate = fake_generate
+        jobs = [(CompanyInfo(name=f"Company {i}"), sample_config) for i in range(5)]
+
+        results = await mock_generator.generate_batch(jobs, concurrency=2)
+
+        assert results == [f"Company {i}" for i in range(5)]
+        assert max_in_flight == 2
+
 
 class TestGeneratorScoring:
     """Tests for keyword scoring"""